@@ -2,24 +2,40 @@
 Database configuration with fallback for CI/CD environment
 """
 
+import asyncio
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 # Configuration conditionnelle pour MongoDB
 try:
     from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
 
     HAS_MONGO = True
 except ImportError:
     HAS_MONGO = False
-    print("⚠️ MongoDB dependencies not available - running in CI mode")
+    logger.warning("MongoDB dependencies not available - running in CI mode")
 
 # Variables d'environnement avec valeurs par défaut pour CI
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
 MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "test_db")
 
+# Options du client : compression réseau (MongoDB 4.2+) et pool adapté aux workers async.
+# La lecture reste sur le primaire par défaut : les services relisent juste après écriture.
+MONGO_CLIENT_OPTIONS = {
+    "compressors": os.getenv("MONGO_COMPRESSORS", "zstd,zlib"),
+    "zlibCompressionLevel": 6,
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "200")),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "20")),
+    "readPreference": os.getenv("MONGO_READ_PREFERENCE", "primary"),
+    "serverSelectionTimeoutMS": 3000,
+}
+
 if HAS_MONGO:
     # Configuration MongoDB normale
-    client = AsyncIOMotorClient(MONGO_URL)
+    client = AsyncIOMotorClient(MONGO_URL, **MONGO_CLIENT_OPTIONS)
     db = client[MONGO_DB_NAME]
 else:
     # Fallback pour CI/CD
@@ -30,19 +46,77 @@ else:
 async def connect_to_mongo():
     """Connect to MongoDB if available"""
     if HAS_MONGO:
-        print("✅ Connecting to MongoDB...")
+        logger.info("Connecting to MongoDB...")
         # Test connection
         await client.admin.command("ping")
-        print("✅ MongoDB connected successfully")
+        logger.info("MongoDB connected successfully")
+        # Indexes are created by scripts.create_indexes, never on the request-serving path
+        await check_unique_email_index()
     else:
-        print("⚠️ MongoDB not available - running in test mode")
+        logger.warning("MongoDB not available - running in test mode")
+
+
+async def ensure_indexes(database=None):
+    """Create indexes (idempotent), one create_indexes per collection, run concurrently.
+
+    Required by the services (unique email, $text search, keyset sorts). The app never
+    builds them itself: run python -m scripts.create_indexes on every deployment (init_data
+    does it too).
+    """
+    if not HAS_MONGO:
+        return
+    database = db if database is None else database
+
+    users_indexes = [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("registerDate", DESCENDING)]),
+        IndexModel([("title", ASCENDING), ("registerDate", DESCENDING)]),
+        IndexModel([("firstName", ASCENDING)]),
+        IndexModel([("lastName", ASCENDING)]),
+        # Recherche plein texte (une regex $options:i ne peut pas utiliser d'index)
+        IndexModel([("firstName", TEXT), ("lastName", TEXT), ("email", TEXT)], name="users_search"),
+    ]
+    # Index composés (filtre, tri) : le tri par publishDate/likes est servi par l'index, sans SORT.
+    # _id départage les valeurs égales (pagination par curseur).
+    posts_indexes = [
+        IndexModel([("owner", ASCENDING), ("publishDate", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("owner", ASCENDING), ("likes", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("tags", ASCENDING), ("publishDate", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("tags", ASCENDING), ("likes", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("publishDate", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("likes", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("text", TEXT)], name="posts_search"),
+    ]
+    comments_indexes = [
+        IndexModel([("post", ASCENDING), ("publishDate", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("owner", ASCENDING), ("publishDate", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("publishDate", DESCENDING), ("_id", DESCENDING)]),
+    ]
+    await asyncio.gather(
+        database.users.create_indexes(users_indexes),
+        database.posts.create_indexes(posts_indexes),
+        database.comments.create_indexes(comments_indexes),
+    )
+    logger.info("MongoDB indexes ensured")
+
+
+async def check_unique_email_index(database=None):
+    """Fail fast when users.email is not unique-indexed: signup relies on it to reject duplicates"""
+    database = db if database is None else database
+    indexes = await database.users.index_information()
+    if not any(
+        index.get("unique") and index["key"] == [("email", ASCENDING)] for index in indexes.values()
+    ):
+        raise RuntimeError(
+            "Missing unique index on users.email: run python -m scripts.create_indexes"
+        )
 
 
 async def close_mongo_connection():
     """Close MongoDB connection if available"""
     if HAS_MONGO and client:
         client.close()
-        print("✅ MongoDB connection closed")
+        logger.info("MongoDB connection closed")
 
 
 def get_database():
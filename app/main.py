@@ -1,38 +1,103 @@
+import logging
 from typing import List, Optional
 
+import orjson
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import Response
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.utils import is_body_allowed_for_status_code
 from pydantic import BaseModel
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette_compress import CompressMiddleware
+
+from app.middleware.edge_cache import EdgeCacheMiddleware
+from app.middleware.language import LanguageMiddleware
+from app.middleware.security import SecurityHeadersMiddleware
+
+# Les messages info (connexion, i18n...) sont filtrés en production
+logging.basicConfig(level=logging.WARNING)
 
 # ✅ CRÉER L'APPLICATION EN PREMIER
 app = FastAPI(
     title="Network Application API",
     description="REST API with CI/CD Pipeline and DevSecOps",
     version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
+    # Docs et schéma servis par les routes ci-dessous (schéma mis en cache en bytes)
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None,
+    default_response_class=ORJSONResponse,
 )
 
+# ✅ LANGUE (Accept-Language analysé une seule fois => request.state.lang)
+app.add_middleware(LanguageMiddleware)
+
+# ✅ COMPRESSION (négociation zstd > br > gzip selon Accept-Encoding)
+app.add_middleware(
+    CompressMiddleware, minimum_size=500, zstd_level=4, brotli_quality=4, gzip_level=6
+)
+
+# ✅ CACHE DES RÉPONSES DÉJÀ COMPRESSÉES (ajouté après => exécuté avant la compression)
+app.add_middleware(EdgeCacheMiddleware, maxsize=1024, ttl=300)
+
+
+# ✅ MIDDLEWARE DE SÉCURITÉ POUR CORRIGER LES ALERTES DAST (+ X-Process-Time)
+app.add_middleware(SecurityHeadersMiddleware)
+
 
-# ✅ MIDDLEWARE DE SÉCURITÉ POUR CORRIGER LES ALERTES DAST
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    response = await call_next(request)
+# ✅ ERREURS HTTP SÉRIALISÉES DIRECTEMENT EN BYTES AVEC ORJSON
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    """Même format que le handler par défaut de FastAPI, sans passer par json"""
+    headers = getattr(exc, "headers", None)
+    if not is_body_allowed_for_status_code(exc.status_code):
+        return Response(status_code=exc.status_code, headers=headers)
+    return Response(
+        content=orjson.dumps({"detail": exc.detail}),
+        status_code=exc.status_code,
+        media_type="application/json",
+        headers=headers,
+    )
 
-    # 🔒 En-têtes de sécurité pour corriger les warnings DAST
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
 
-    # ✅ Correction pour Sec-Fetch-Dest Header [90005]
-    response.headers["Cross-Origin-Embedder-Policy"] = "require-corp"
-    response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
-    response.headers["Cross-Origin-Resource-Policy"] = "same-origin"
+# ✅ SCHÉMA OPENAPI SÉRIALISÉ UNE SEULE FOIS
+_openapi_bytes: Optional[bytes] = None
 
-    return response
+
+@app.get("/openapi.json", include_in_schema=False)
+async def openapi_json():
+    """Schéma OpenAPI, généré et sérialisé au premier appel"""
+    global _openapi_bytes
+    if _openapi_bytes is None:
+        _openapi_bytes = orjson.dumps(app.openapi())
+    return Response(content=_openapi_bytes, media_type="application/json")
+
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui_html():
+    """Swagger UI"""
+    return get_swagger_ui_html(
+        openapi_url="/openapi.json",
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url="/docs/oauth2-redirect",
+    )
+
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+async def swagger_ui_redirect():
+    """Redirection OAuth2 de Swagger UI"""
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc_html():
+    """ReDoc"""
+    return get_redoc_html(openapi_url="/openapi.json", title=f"{app.title} - ReDoc")
 
 
 # ✅ ROUTE POUR ROBOTS.TXT (corrige le 404)
@@ -86,31 +151,36 @@ class User(BaseModel):
 items_db = []
 users_db = []
 
+# Réponses statiques construites une seule fois au chargement du module
+_ROOT_PAYLOAD = {
+    "message": "Welcome to Network Application API",
+    "version": "1.0.0",
+    "endpoints": {
+        "docs": "/docs",
+        "health": "/health",
+        "items": "/items",
+        "users": "/users",
+    },
+}
+
+_HEALTH_PAYLOAD = {
+    "status": "healthy",
+    "service": "Network Application API",
+    "version": "1.0.0",
+}
+
 
 # ✅ DÉFINIR LES ROUTES APRÈS
 @app.get("/")
 async def root():
     """Route racine"""
-    return {
-        "message": "Welcome to Network Application API",
-        "version": "1.0.0",
-        "endpoints": {
-            "docs": "/docs",
-            "health": "/health",
-            "items": "/items",
-            "users": "/users",
-        },
-    }
+    return _ROOT_PAYLOAD
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint pour Docker et monitoring"""
-    return {
-        "status": "healthy",
-        "service": "Network Application API",
-        "version": "1.0.0",
-    }
+    return _HEALTH_PAYLOAD
 
 
 # Routes pour Items
@@ -173,6 +243,6 @@ async def create_user(user: User):
     return user
 
 
-# Lancer l'application en local
+# Lancer l'application en local, depuis la racine du dépôt : python -m app.main
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
+    uvicorn.run("app.main:app", host="127.0.0.1", port=8000, reload=True)
@@ -0,0 +1,87 @@
+from cachetools import TTLCache
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Exact list paths only: single resources (/posts/{id}...) are never cached
+CACHEABLE_PATHS = ("/api/v1/comments", "/api/v1/posts", "/api/v1/tags")
+# Any write under the API empties the cache (user edits show up in post/comment owners)
+INVALIDATING_PREFIX = "/api/v1/"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STORED_HEADERS = ("content-type", "content-encoding", "vary", "cache-control")
+
+
+class EdgeCacheMiddleware:
+    """Cache already-encoded GET response bodies per (path, query, Accept-Encoding/-Language).
+
+    Must wrap the compression middleware so that a hit skips routing,
+    serialization and compression entirely. The cache is per process: writes clear it
+    in the worker that served them, the TTL bounds staleness in the others.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        maxsize: int = 1024,
+        ttl: int = 300,
+        paths=CACHEABLE_PATHS,
+        invalidating_prefix: str = INVALIDATING_PREFIX,
+    ):
+        self.app = app
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.paths = frozenset(paths)
+        self.invalidating_prefix = invalidating_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] not in SAFE_METHODS:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                # Cleared once the write is done, so no request can re-cache the old state
+                if scope["path"].startswith(self.invalidating_prefix):
+                    self.cache.clear()
+            return
+
+        if scope["method"] != "GET" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        # Dates are rendered per language, so the language is part of the key
+        key = (
+            scope["path"],
+            scope["query_string"],
+            headers.get("accept-encoding", ""),
+            headers.get("accept-language", ""),
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            body, headers = cached
+            response = Response(content=body, headers={**headers, "X-Cache": "HIT"})
+            await response(scope, receive, send)
+            return
+
+        status = None
+        stored_headers = {}
+        chunks = []
+
+        # Stream the response through unchanged, keeping a copy of 200 bodies
+        async def send_and_store(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if status == 200:
+                    headers = MutableHeaders(scope=message)
+                    stored_headers.update((k, v) for k, v in headers.items() if k in STORED_HEADERS)
+                    headers["X-Cache"] = "MISS"
+            elif message["type"] == "http.response.body" and status == 200:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self.cache[key] = (b"".join(chunks), stored_headers)
+            await send(message)
+
+        await self.app(scope, receive, send_and_store)
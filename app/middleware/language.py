@@ -0,0 +1,18 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.i18n import parse_lang
+
+
+class LanguageMiddleware:
+    """Parse Accept-Language once per request into request.state.lang"""
+
+    def __init__(self, app: ASGIApp, default: str = "en"):
+        self.app = app
+        self.default = default
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            header = Headers(scope=scope).get("accept-language") or self.default
+            scope.setdefault("state", {})["lang"] = parse_lang(header)
+        await self.app(scope, receive, send)
@@ -1,45 +1,43 @@
-from typing import Literal, Optional
+from dataclasses import dataclass
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Header, Path, Query, Request
+from fastapi import APIRouter, Depends, Path, Query, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 
 from app.schemas.comment import Comment, CommentCreate
-from app.schemas.common import DeleteResponse, PaginatedResponse, SortOrder
+from app.schemas.common import DeleteResponse, PaginatedResponse, SortDirection
 from app.services.comment_service import CommentService
 from app.utils.errors import ResourceNotFoundError
+from app.utils.hateoas import add_comment_hateoas_links, add_pagination_links, get_base_url
+from app.utils.pagination import encode_cursor
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 comment_service = CommentService()
 
+# Une seule passe de sérialisation pydantic pour toute la page
+_COMMENT_LIST_ADAPTER = TypeAdapter(List[Comment])
 
-def add_comment_hateoas_links(comment_id: str, post_id: str, owner_id: str, base_url: str) -> dict:
-    """Add HATEOAS links to comment"""
-    return {
-        "self": {"href": f"{base_url}/api/v1/comments/{comment_id}"},
-        "post": {"href": f"{base_url}/api/v1/posts/{post_id}"},
-        "owner": {"href": f"{base_url}/api/v1/users/{owner_id}"},
-    }
 
+def comments_to_response(comments: List[Comment], base_url: str) -> List[dict]:
+    """Dump a page of comments in one adapter call and attach their HATEOAS links"""
+    comments_data = _COMMENT_LIST_ADAPTER.dump_python(comments)
+    for comment, comment_dict in zip(comments, comments_data):
+        comment_dict["_links"] = add_comment_hateoas_links(
+            comment.id, comment.post, comment.owner.id, base_url
+        )
+    return comments_data
 
-def add_pagination_links(
-    base_url: str, endpoint: str, page: int, limit: int, total: int, **params
-) -> dict:
-    """Add HATEOAS pagination links"""
-    total_pages = (total + limit - 1) // limit
-    query_params = "&".join([f"{k}={v}" for k, v in params.items() if v is not None])
-    query_string = f"&{query_params}" if query_params else ""
-
-    links = {
-        "self": {"href": f"{base_url}{endpoint}?page={page}&limit={limit}{query_string}"},
-        "first": {"href": f"{base_url}{endpoint}?page=1&limit={limit}{query_string}"},
-        "last": {"href": f"{base_url}{endpoint}?page={total_pages}&limit={limit}{query_string}"},
-    }
 
-    if page > 1:
-        links["prev"] = {"href": f"{base_url}{endpoint}?page={page-1}&limit={limit}{query_string}"}
-    if page < total_pages:
-        links["next"] = {"href": f"{base_url}{endpoint}?page={page+1}&limit={limit}{query_string}"}
+@dataclass
+class ListParams:
+    """Query parameters shared by the comment list endpoints"""
 
-    return links
+    page: int = Query(1, ge=1)
+    limit: int = Query(20, ge=1, le=100)
+    sort_by: Literal["publishDate"] = Query("publishDate")
+    sort_order: SortDirection = Query("desc")
+    cursor: Optional[str] = Query(None, description="Keyset cursor from _links.next")
 
 
 @router.get(
@@ -50,13 +48,9 @@ def add_pagination_links(
 )
 async def get_comments(
     request: Request,
-    page: int = Query(1, ge=1),
-    limit: int = Query(20, ge=1, le=100),
-    sort_by: Literal["publishDate"] = Query("publishDate"),
-    sort_order: SortOrder = Query(SortOrder.DESC),
+    params: ListParams = Depends(),
     post: Optional[str] = Query(None, description="Filter by post ID"),
     user: Optional[str] = Query(None, description="Filter by user ID"),
-    accept_language: Optional[str] = Header("en"),
 ):
     """Get list of comments"""
     filters = {}
@@ -66,32 +60,39 @@ async def get_comments(
         filters["owner"] = user
 
     comments, total = await comment_service.get_comments(
-        page, limit, sort_by, sort_order.value, filters
+        params.page,
+        params.limit,
+        params.sort_by,
+        params.sort_order,
+        filters,
+        cursor=params.cursor,
     )
+    next_cursor = encode_cursor(comments[-1].publishDate, comments[-1].id) if comments else None
 
-    base_url = str(request.base_url).rstrip("/")
-    for comment in comments:
-        comment._links = add_comment_hateoas_links(
-            comment.id, comment.post, comment.owner.id, base_url
-        )
+    base_url = get_base_url(request)
+    comments_data = comments_to_response(comments, base_url)
 
     endpoint = "/api/v1/comments"
-    return PaginatedResponse(
-        data=comments,
-        total=total,
-        page=page,
-        limit=limit,
-        _links=add_pagination_links(
-            base_url,
-            endpoint,
-            page,
-            limit,
-            total,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            post=post,
-            user=user,
-        ),
+    return ORJSONResponse(
+        {
+            "data": comments_data,
+            "total": total,
+            "page": params.page,
+            "limit": params.limit,
+            "_links": add_pagination_links(
+                base_url,
+                endpoint,
+                params.page,
+                params.limit,
+                total,
+                next_cursor=next_cursor,
+                cursor=params.cursor,
+                sort_by=params.sort_by,
+                sort_order=params.sort_order,
+                post=post,
+                user=user,
+            ),
+        }
     )
 
 
@@ -104,38 +105,41 @@ async def get_comments(
 async def get_comments_by_post(
     request: Request,
     post_id: str = Path(...),
-    page: int = Query(1, ge=1),
-    limit: int = Query(20, ge=1, le=100),
-    sort_by: Literal["publishDate"] = Query("publishDate"),
-    sort_order: SortOrder = Query(SortOrder.DESC),
-    accept_language: Optional[str] = Header("en"),
+    params: ListParams = Depends(),
 ):
     """Get comments by post ID"""
     filters = {"post": post_id}
     comments, total = await comment_service.get_comments(
-        page, limit, sort_by, sort_order.value, filters
+        params.page,
+        params.limit,
+        params.sort_by,
+        params.sort_order,
+        filters,
+        cursor=params.cursor,
     )
-
-    base_url = str(request.base_url).rstrip("/")
-    for comment in comments:
-        comment._links = add_comment_hateoas_links(
-            comment.id, comment.post, comment.owner.id, base_url
-        )
-
-    return PaginatedResponse(
-        data=comments,
-        total=total,
-        page=page,
-        limit=limit,
-        _links=add_pagination_links(
-            base_url,
-            f"/api/v1/comments/post/{post_id}",
-            page,
-            limit,
-            total,
-            sort_by=sort_by,
-            sort_order=sort_order,
-        ),
+    next_cursor = encode_cursor(comments[-1].publishDate, comments[-1].id) if comments else None
+
+    base_url = get_base_url(request)
+    comments_data = comments_to_response(comments, base_url)
+
+    return ORJSONResponse(
+        {
+            "data": comments_data,
+            "total": total,
+            "page": params.page,
+            "limit": params.limit,
+            "_links": add_pagination_links(
+                base_url,
+                f"/api/v1/comments/post/{post_id}",
+                params.page,
+                params.limit,
+                total,
+                next_cursor=next_cursor,
+                cursor=params.cursor,
+                sort_by=params.sort_by,
+                sort_order=params.sort_order,
+            ),
+        }
     )
 
 
@@ -148,38 +152,41 @@ async def get_comments_by_post(
 async def get_comments_by_user(
     request: Request,
     user_id: str = Path(...),
-    page: int = Query(1, ge=1),
-    limit: int = Query(20, ge=1, le=100),
-    sort_by: Literal["publishDate"] = Query("publishDate"),
-    sort_order: SortOrder = Query(SortOrder.DESC),
-    accept_language: Optional[str] = Header("en"),
+    params: ListParams = Depends(),
 ):
     """Get comments by user ID"""
     filters = {"owner": user_id}
     comments, total = await comment_service.get_comments(
-        page, limit, sort_by, sort_order.value, filters
+        params.page,
+        params.limit,
+        params.sort_by,
+        params.sort_order,
+        filters,
+        cursor=params.cursor,
     )
-
-    base_url = str(request.base_url).rstrip("/")
-    for comment in comments:
-        comment._links = add_comment_hateoas_links(
-            comment.id, comment.post, comment.owner.id, base_url
-        )
-
-    return PaginatedResponse(
-        data=comments,
-        total=total,
-        page=page,
-        limit=limit,
-        _links=add_pagination_links(
-            base_url,
-            f"/api/v1/comments/user/{user_id}",
-            page,
-            limit,
-            total,
-            sort_by=sort_by,
-            sort_order=sort_order,
-        ),
+    next_cursor = encode_cursor(comments[-1].publishDate, comments[-1].id) if comments else None
+
+    base_url = get_base_url(request)
+    comments_data = comments_to_response(comments, base_url)
+
+    return ORJSONResponse(
+        {
+            "data": comments_data,
+            "total": total,
+            "page": params.page,
+            "limit": params.limit,
+            "_links": add_pagination_links(
+                base_url,
+                f"/api/v1/comments/user/{user_id}",
+                params.page,
+                params.limit,
+                total,
+                next_cursor=next_cursor,
+                cursor=params.cursor,
+                sort_by=params.sort_by,
+                sort_order=params.sort_order,
+            ),
+        }
     )
 
 
@@ -193,12 +200,11 @@ async def get_comments_by_user(
 async def create_comment(
     request: Request,
     comment_data: CommentCreate,
-    accept_language: Optional[str] = Header("en"),
 ):
     """Create new comment"""
     comment = await comment_service.create_comment(comment_data)
 
-    base_url = str(request.base_url).rstrip("/")
+    base_url = get_base_url(request)
     comment._links = add_comment_hateoas_links(comment.id, comment.post, comment.owner.id, base_url)
 
     return comment
@@ -210,9 +216,7 @@ async def create_comment(
     summary="Delete comment",
     description="Delete comment by ID",
 )
-async def delete_comment(
-    comment_id: str = Path(...), accept_language: Optional[str] = Header("en")
-):
+async def delete_comment(comment_id: str = Path(...)):
     """Delete comment by ID"""
     success = await comment_service.delete_comment(comment_id)
 
@@ -1,46 +1,51 @@
 from typing import Literal, Optional
 
-from fastapi import APIRouter, Header, Path, Query, Request
+from fastapi import APIRouter, Depends, Path, Query, Request
+from fastapi.responses import ORJSONResponse
 
-from app.schemas.common import DeleteResponse, SortOrder
-from app.schemas.post import PostCreate, PostUpdate
+from app.schemas.common import DeleteResponse, SortDirection
+from app.schemas.post import PostCreate, PostFull, PostPreview, PostUpdate
+from app.schemas.user import UserPreview
 from app.services.post_service import PostService
 from app.utils.errors import ResourceNotFoundError
-from app.utils.i18n import format_date
+from app.utils.hateoas import add_pagination_links, add_post_hateoas_links, get_base_url
+from app.utils.i18n import format_date, get_lang
+from app.utils.pagination import encode_cursor
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 post_service = PostService()
 
 
-def add_post_hateoas_links(post_id: str, owner_id: str, base_url: str) -> dict:
-    """Add HATEOAS links to post"""
+def owner_to_response(owner: UserPreview) -> dict:
+    """Build the owner preview dict by attribute access (no model_dump walk)"""
     return {
-        "self": {"href": f"{base_url}/api/v1/posts/{post_id}"},
-        "owner": {"href": f"{base_url}/api/v1/users/{owner_id}"},
-        "comments": {"href": f"{base_url}/api/v1/comments?post={post_id}"},
+        "id": owner.id,
+        "title": owner.title,
+        "firstName": owner.firstName,
+        "lastName": owner.lastName,
+        "picture": owner.picture,
     }
 
 
-def add_pagination_links(
-    base_url: str, endpoint: str, page: int, limit: int, total: int, **params
-) -> dict:
-    """Add HATEOAS pagination links"""
-    total_pages = (total + limit - 1) // limit
-    query_params = "&".join([f"{k}={v}" for k, v in params.items() if v is not None])
-    query_string = f"&{query_params}" if query_params else ""
-
-    links = {
-        "self": {"href": f"{base_url}{endpoint}?page={page}&limit={limit}{query_string}"},
-        "first": {"href": f"{base_url}{endpoint}?page=1&limit={limit}{query_string}"},
-        "last": {"href": f"{base_url}{endpoint}?page={total_pages}&limit={limit}{query_string}"},
+def post_preview_to_response(post: PostPreview, lang: str, base_url: str) -> dict:
+    """Build the response dict of a listed post in one pass"""
+    return {
+        "id": post.id,
+        "text": post.text,
+        "image": post.image,
+        "likes": post.likes,
+        "tags": post.tags,
+        "publishDate": format_date(post.publishDate, lang),
+        "owner": owner_to_response(post.owner),
+        "_links": add_post_hateoas_links(post.id, post.owner.id, base_url),
     }
 
-    if page > 1:
-        links["prev"] = {"href": f"{base_url}{endpoint}?page={page-1}&limit={limit}{query_string}"}
-    if page < total_pages:
-        links["next"] = {"href": f"{base_url}{endpoint}?page={page+1}&limit={limit}{query_string}"}
 
-    return links
+def post_full_to_response(post: PostFull, lang: str, base_url: str) -> dict:
+    """Build the response dict of a single post in one pass"""
+    post_dict = post_preview_to_response(post, lang, base_url)
+    post_dict["link"] = post.link
+    return post_dict
 
 
 @router.get("")
@@ -49,57 +54,53 @@ async def get_posts(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     sort_by: Literal["publishDate", "likes"] = Query("publishDate"),
-    sort_order: SortOrder = Query(SortOrder.DESC),
-    search: Optional[str] = Query(None),
-    accept_language: Optional[str] = Header("en"),
+    sort_order: SortDirection = Query("desc"),
+    search: Optional[str] = Query(
+        None, description="Whole words in the post text (stemmed, any word matches)"
+    ),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from _links.next"),
+    lang: str = Depends(get_lang),
 ):
     """Get list of posts with formatted dates"""
     filters = {}
     if search:
-        filters["text"] = {"$regex": search, "$options": "i"}
-
-    posts, total = await post_service.get_posts(page, limit, sort_by, sort_order.value, filters)
-
-    # Extraire la langue
-    lang = accept_language.split(",")[0].strip()[:2]
-
-    base_url = str(request.base_url).rstrip("/")
-
-    # Formater les dates pour chaque post
-    posts_data = []
-    for post in posts:
-        post_dict = post.model_dump()
-
-        # Formater publishDate
-        if post_dict.get("publishDate"):
-            post_dict["publishDate"] = format_date(post.publishDate, lang)
-
-        # Formater owner si nécessaire
-        if post_dict.get("owner") and isinstance(post_dict["owner"], dict):
-            # Owner est déjà un dict, pas besoin de conversion
-            pass
-
-        # HATEOAS
-        post_dict["_links"] = add_post_hateoas_links(post.id, post.owner.id, base_url)
-
-        posts_data.append(post_dict)
-
-    return {
-        "data": posts_data,
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "_links": add_pagination_links(
-            base_url,
-            "/api/v1/posts",
-            page,
-            limit,
-            total,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            search=search,
-        ),
-    }
+        # Index posts_search (python -m scripts.create_indexes)
+        filters["$text"] = {"$search": search}
+
+    posts, total = await post_service.get_posts(
+        page, limit, sort_by, sort_order, filters, cursor=cursor
+    )
+    next_cursor = (
+        encode_cursor(posts[-1].publishDate, posts[-1].id)
+        if posts and sort_by == "publishDate"
+        else None
+    )
+
+    base_url = get_base_url(request)
+
+    posts_data = [post_preview_to_response(post, lang, base_url) for post in posts]
+
+    # Rendu direct par orjson, sans repasser par jsonable_encoder
+    return ORJSONResponse(
+        {
+            "data": posts_data,
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "_links": add_pagination_links(
+                base_url,
+                "/api/v1/posts",
+                page,
+                limit,
+                total,
+                next_cursor=next_cursor,
+                cursor=cursor,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                search=search,
+            ),
+        }
+    )
 
 
 @router.get("/user/{user_id}")
@@ -109,44 +110,45 @@ async def get_posts_by_user(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     sort_by: Literal["publishDate", "likes"] = Query("publishDate"),
-    sort_order: SortOrder = Query(SortOrder.DESC),
-    accept_language: Optional[str] = Header("en"),
+    sort_order: SortDirection = Query("desc"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from _links.next"),
+    lang: str = Depends(get_lang),
 ):
     """Get posts by user with formatted dates"""
     filters = {"owner": user_id}
-    posts, total = await post_service.get_posts(page, limit, sort_by, sort_order.value, filters)
-
-    # Extraire la langue
-    lang = accept_language.split(",")[0].strip()[:2]
-
-    base_url = str(request.base_url).rstrip("/")
-
-    # Formater les dates
-    posts_data = []
-    for post in posts:
-        post_dict = post.model_dump()
-
-        if post_dict.get("publishDate"):
-            post_dict["publishDate"] = format_date(post.publishDate, lang)
-
-        post_dict["_links"] = add_post_hateoas_links(post.id, post.owner.id, base_url)
-        posts_data.append(post_dict)
-
-    return {
-        "data": posts_data,
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "_links": add_pagination_links(
-            base_url,
-            f"/api/v1/posts/user/{user_id}",
-            page,
-            limit,
-            total,
-            sort_by=sort_by,
-            sort_order=sort_order,
-        ),
-    }
+    posts, total = await post_service.get_posts(
+        page, limit, sort_by, sort_order, filters, cursor=cursor
+    )
+    next_cursor = (
+        encode_cursor(posts[-1].publishDate, posts[-1].id)
+        if posts and sort_by == "publishDate"
+        else None
+    )
+
+    base_url = get_base_url(request)
+
+    posts_data = [post_preview_to_response(post, lang, base_url) for post in posts]
+
+    # Rendu direct par orjson, sans repasser par jsonable_encoder
+    return ORJSONResponse(
+        {
+            "data": posts_data,
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "_links": add_pagination_links(
+                base_url,
+                f"/api/v1/posts/user/{user_id}",
+                page,
+                limit,
+                total,
+                next_cursor=next_cursor,
+                cursor=cursor,
+                sort_by=sort_by,
+                sort_order=sort_order,
+            ),
+        }
+    )
 
 
 @router.get("/tag/{tag}")
@@ -156,51 +158,52 @@ async def get_posts_by_tag(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     sort_by: Literal["publishDate", "likes"] = Query("publishDate"),
-    sort_order: SortOrder = Query(SortOrder.DESC),
-    accept_language: Optional[str] = Header("en"),
+    sort_order: SortDirection = Query("desc"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from _links.next"),
+    lang: str = Depends(get_lang),
 ):
     """Get posts by tag with formatted dates"""
     filters = {"tags": tag}
-    posts, total = await post_service.get_posts(page, limit, sort_by, sort_order.value, filters)
-
-    # Extraire la langue
-    lang = accept_language.split(",")[0].strip()[:2]
-
-    base_url = str(request.base_url).rstrip("/")
-
-    # Formater les dates
-    posts_data = []
-    for post in posts:
-        post_dict = post.model_dump()
-
-        if post_dict.get("publishDate"):
-            post_dict["publishDate"] = format_date(post.publishDate, lang)
-
-        post_dict["_links"] = add_post_hateoas_links(post.id, post.owner.id, base_url)
-        posts_data.append(post_dict)
-
-    return {
-        "data": posts_data,
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "_links": add_pagination_links(
-            base_url,
-            f"/api/v1/posts/tag/{tag}",
-            page,
-            limit,
-            total,
-            sort_by=sort_by,
-            sort_order=sort_order,
-        ),
-    }
+    posts, total = await post_service.get_posts(
+        page, limit, sort_by, sort_order, filters, cursor=cursor
+    )
+    next_cursor = (
+        encode_cursor(posts[-1].publishDate, posts[-1].id)
+        if posts and sort_by == "publishDate"
+        else None
+    )
+
+    base_url = get_base_url(request)
+
+    posts_data = [post_preview_to_response(post, lang, base_url) for post in posts]
+
+    # Rendu direct par orjson, sans repasser par jsonable_encoder
+    return ORJSONResponse(
+        {
+            "data": posts_data,
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "_links": add_pagination_links(
+                base_url,
+                f"/api/v1/posts/tag/{tag}",
+                page,
+                limit,
+                total,
+                next_cursor=next_cursor,
+                cursor=cursor,
+                sort_by=sort_by,
+                sort_order=sort_order,
+            ),
+        }
+    )
 
 
 @router.get("/{post_id}")
 async def get_post(
     request: Request,
     post_id: str = Path(...),
-    accept_language: Optional[str] = Header("en"),
+    lang: str = Depends(get_lang),
 ):
     """Get post by ID with formatted date"""
     post = await post_service.get_post_by_id(post_id)
@@ -208,47 +211,19 @@ async def get_post(
     if not post:
         raise ResourceNotFoundError(f"Post with id {post_id} not found")
 
-    # Extraire la langue
-    lang = accept_language.split(",")[0].strip()[:2]
-
-    # Convertir en dict
-    post_dict = post.model_dump()
-
-    # REMPLACER la date
-    if post_dict.get("publishDate"):
-        post_dict["publishDate"] = format_date(post.publishDate, lang)
-
-    # HATEOAS
-    base_url = str(request.base_url).rstrip("/")
-    post_dict["_links"] = add_post_hateoas_links(post.id, post.owner.id, base_url)
-
-    return post_dict
+    return post_full_to_response(post, lang, get_base_url(request))
 
 
 @router.post("", status_code=201)
 async def create_post(
     request: Request,
     post_data: PostCreate,
-    accept_language: Optional[str] = Header("en"),
+    lang: str = Depends(get_lang),
 ):
     """Create new post"""
     post = await post_service.create_post(post_data)
 
-    # Extraire la langue
-    lang = accept_language.split(",")[0].strip()[:2]
-
-    # Convertir en dict
-    post_dict = post.model_dump()
-
-    # REMPLACER la date
-    if post_dict.get("publishDate"):
-        post_dict["publishDate"] = format_date(post.publishDate, lang)
-
-    # HATEOAS
-    base_url = str(request.base_url).rstrip("/")
-    post_dict["_links"] = add_post_hateoas_links(post.id, post.owner.id, base_url)
-
-    return post_dict
+    return post_full_to_response(post, lang, get_base_url(request))
 
 
 @router.put("/{post_id}")
@@ -256,7 +231,7 @@ async def update_post(
     request: Request,
     post_id: str,
     post_data: PostUpdate,
-    accept_language: Optional[str] = Header("en"),
+    lang: str = Depends(get_lang),
 ):
     """Update post"""
     post = await post_service.update_post(post_id, post_data)
@@ -264,25 +239,11 @@ async def update_post(
     if not post:
         raise ResourceNotFoundError(f"Post with id {post_id} not found")
 
-    # Extraire la langue
-    lang = accept_language.split(",")[0].strip()[:2]
-
-    # Convertir en dict
-    post_dict = post.model_dump()
-
-    # REMPLACER la date
-    if post_dict.get("publishDate"):
-        post_dict["publishDate"] = format_date(post.publishDate, lang)
-
-    # HATEOAS
-    base_url = str(request.base_url).rstrip("/")
-    post_dict["_links"] = add_post_hateoas_links(post.id, post.owner.id, base_url)
-
-    return post_dict
+    return post_full_to_response(post, lang, get_base_url(request))
 
 
 @router.delete("/{post_id}", response_model=DeleteResponse)
-async def delete_post(post_id: str, accept_language: Optional[str] = Header("en")):
+async def delete_post(post_id: str):
     """Delete post"""
     success = await post_service.delete_post(post_id)
 
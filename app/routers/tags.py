@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Request
 
 from app.services.tag_service import TagService
+from app.utils.hateoas import add_tag_hateoas_links, get_base_url
 
 router = APIRouter()
 tag_service = TagService()
@@ -10,19 +11,9 @@ tag_service = TagService()
 async def get_tags(request: Request):
     """Get list of all tags"""
     tags = await tag_service.get_all_tags()
-    base_url = str(request.base_url).rstrip("/")
+    base_url = get_base_url(request)
 
-    tags_with_links = []
-    for tag in tags:
-        tags_with_links.append(
-            {
-                "tag": tag,
-                "_links": {
-                    "self": {"href": f"{base_url}/api/v1/tags"},
-                    "posts": {"href": f"{base_url}/api/v1/posts/tag/{tag}"},
-                },
-            }
-        )
+    tags_with_links = [{"tag": tag, "_links": add_tag_hateoas_links(tag, base_url)} for tag in tags]
 
     return {
         "data": tags_with_links,
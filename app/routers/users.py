@@ -1,68 +1,55 @@
+import re
 from typing import Literal, Optional
 
-from bson import ObjectId
-from bson.errors import InvalidId
-from fastapi import APIRouter, Header, Query, Request
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import ORJSONResponse
 
-from app.schemas.common import DeleteResponse, PaginatedResponse, SortOrder
-from app.schemas.user import UserCreate, UserPreview, UserUpdate
+from app.schemas.common import DeleteResponse, PaginatedResponse, SortDirection
+from app.schemas.user import UserCreate, UserFull, UserPreview, UserUpdate
 from app.services.user_service import UserService
 from app.utils.errors import ParamsNotValidError, ResourceNotFoundError
-from app.utils.i18n import format_date
+from app.utils.hateoas import add_pagination_links, add_user_hateoas_links, get_base_url
+from app.utils.i18n import format_date, get_lang
+from app.utils.object_id import is_object_id
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 user_service = UserService()
 
+# Dates formatées à la main : inutile de les sérialiser dans model_dump()
+USER_DATE_FIELDS = {"registerDate", "dateOfBirth"}
+
 
 def validate_user_id(user_id: str) -> str:
     """Validate MongoDB ObjectId format"""
-    try:
-        if not ObjectId.is_valid(user_id):
-            raise ParamsNotValidError(
-                param="user_id",
-                value=user_id,
-                issue="Must be a valid MongoDB ObjectId (24 hex characters)",
-                expected_format="24-character hexadecimal string",
-            )
-        return user_id
-    except (InvalidId, TypeError):
+    if not is_object_id(user_id):
         raise ParamsNotValidError(
             param="user_id",
             value=user_id,
             issue="Must be a valid MongoDB ObjectId (24 hex characters)",
             expected_format="24-character hexadecimal string",
         )
+    return user_id
 
 
-def add_user_hateoas_links(user_id: str, base_url: str) -> dict:
-    """Add HATEOAS links to user"""
+def user_preview_to_response(user: UserPreview, base_url: str) -> dict:
+    """Build the response dict of a listed user in one pass"""
     return {
-        "self": {"href": f"{base_url}/api/v1/users/{user_id}"},
-        "posts": {"href": f"{base_url}/api/v1/posts/user/{user_id}"},
-        "comments": {"href": f"{base_url}/api/v1/comments/user/{user_id}"},
+        "id": user.id,
+        "title": user.title,
+        "firstName": user.firstName,
+        "lastName": user.lastName,
+        "picture": user.picture,
+        "_links": add_user_hateoas_links(user.id, base_url),
     }
 
 
-def add_pagination_links(
-    base_url: str, endpoint: str, page: int, limit: int, total: int, **params
-) -> dict:
-    """Add HATEOAS pagination links"""
-    total_pages = (total + limit - 1) // limit
-    query_params = "&".join([f"{k}={v}" for k, v in params.items() if v is not None])
-    query_string = f"&{query_params}" if query_params else ""
-
-    links = {
-        "self": {"href": f"{base_url}{endpoint}?page={page}&limit={limit}{query_string}"},
-        "first": {"href": f"{base_url}{endpoint}?page=1&limit={limit}{query_string}"},
-        "last": {"href": f"{base_url}{endpoint}?page={total_pages}&limit={limit}{query_string}"},
-    }
-
-    if page > 1:
-        links["prev"] = {"href": f"{base_url}{endpoint}?page={page-1}&limit={limit}{query_string}"}
-    if page < total_pages:
-        links["next"] = {"href": f"{base_url}{endpoint}?page={page+1}&limit={limit}{query_string}"}
-
-    return links
+def user_full_to_response(user: UserFull, lang: str, base_url: str) -> dict:
+    """Build the response dict of a single user, dates formatted instead of dumped"""
+    user_dict = user.model_dump(exclude=USER_DATE_FIELDS)
+    user_dict["registerDate"] = format_date(user.registerDate, lang)
+    user_dict["dateOfBirth"] = format_date(user.dateOfBirth, lang) if user.dateOfBirth else None
+    user_dict["_links"] = add_user_hateoas_links(user.id, base_url)
+    return user_dict
 
 
 @router.get("", response_model=PaginatedResponse[UserPreview])
@@ -71,39 +58,56 @@ async def get_users(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     sort_by: Literal["registerDate", "firstName", "lastName"] = Query("registerDate"),
-    sort_order: SortOrder = Query(SortOrder.DESC),
+    sort_order: SortDirection = Query("desc"),
     title: Optional[str] = Query(None),
-    search: Optional[str] = Query(None),
-    accept_language: Optional[str] = Header("en"),
+    search: Optional[str] = Query(
+        None,
+        description=(
+            "Whole words (stemmed, any word matches) in first name, last name or email; "
+            "a search containing '@' matches email substrings instead"
+        ),
+    ),
 ):
     """Get list of users"""
     filters = {}
     if title:
         filters["title"] = title
-    if search:
-        filters["$or"] = [
-            {"firstName": {"$regex": search, "$options": "i"}},
-            {"lastName": {"$regex": search, "$options": "i"}},
-            {"email": {"$regex": search, "$options": "i"}},
-        ]
-
-    users, total = await user_service.get_users(page, limit, sort_by, sort_order.value, filters)
-
-    base_url = str(request.base_url).rstrip("/")
-    for user in users:
-        user._links = add_user_hateoas_links(user.id, base_url)
-
-    return PaginatedResponse(
-        data=users,
-        total=total,
-        page=page,
-        limit=limit,
-        _links=add_pagination_links(base_url, "/api/v1/users", page, limit, total),
+    if search and "@" in search:
+        # $text would split an address into words (any @example.com user would match)
+        filters["email"] = {"$regex": re.escape(search), "$options": "i"}
+    elif search:
+        # Index users_search (python -m scripts.create_indexes)
+        filters["$text"] = {"$search": search}
+
+    users, total = await user_service.get_users(page, limit, sort_by, sort_order, filters)
+
+    base_url = get_base_url(request)
+    users_data = [user_preview_to_response(user, base_url) for user in users]
+
+    # Rendu direct par orjson, sans repasser par jsonable_encoder
+    return ORJSONResponse(
+        {
+            "data": users_data,
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "_links": add_pagination_links(
+                base_url,
+                "/api/v1/users",
+                page,
+                limit,
+                total,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                title=title,
+                search=search,
+            ),
+        }
     )
 
 
 @router.get("/{user_id}")
-async def get_user(user_id: str, request: Request, accept_language: Optional[str] = Header("en")):
+async def get_user(user_id: str, request: Request, lang: str = Depends(get_lang)):
     """Get user by ID with dates formatted according to language"""
     # Validate user_id format
     validate_user_id(user_id)
@@ -112,53 +116,19 @@ async def get_user(user_id: str, request: Request, accept_language: Optional[str
     if not user:
         raise ResourceNotFoundError(resource="User", identifier=user_id, searched_by="id")
 
-    # Extraire la langue
-    lang = accept_language.split(",")[0].strip()[:2]
-
-    # Convertir en dictionnaire
-    user_dict = user.model_dump()
-
-    # REMPLACER les dates ISO par les dates formatées
-    if user_dict.get("registerDate"):
-        user_dict["registerDate"] = format_date(user.registerDate, lang)
-
-    if user_dict.get("dateOfBirth") and user.dateOfBirth:
-        user_dict["dateOfBirth"] = format_date(user.dateOfBirth, lang)
-
-    # HATEOAS
-    base_url = str(request.base_url).rstrip("/")
-    user_dict["_links"] = add_user_hateoas_links(user.id, base_url)
-
-    return user_dict
+    return user_full_to_response(user, lang, get_base_url(request))
 
 
 @router.post("", status_code=201)
 async def create_user(
     user_data: UserCreate,
     request: Request,
-    accept_language: Optional[str] = Header("en"),
+    lang: str = Depends(get_lang),
 ):
     """Create new user"""
     user = await user_service.create_user(user_data)
 
-    # Extraire la langue
-    lang = accept_language.split(",")[0].strip()[:2]
-
-    # Convertir en dictionnaire
-    user_dict = user.model_dump()
-
-    # REMPLACER les dates
-    if user_dict.get("registerDate"):
-        user_dict["registerDate"] = format_date(user.registerDate, lang)
-
-    if user_dict.get("dateOfBirth") and user.dateOfBirth:
-        user_dict["dateOfBirth"] = format_date(user.dateOfBirth, lang)
-
-    # HATEOAS
-    base_url = str(request.base_url).rstrip("/")
-    user_dict["_links"] = add_user_hateoas_links(user.id, base_url)
-
-    return user_dict
+    return user_full_to_response(user, lang, get_base_url(request))
 
 
 @router.put("/{user_id}")
@@ -166,7 +136,7 @@ async def update_user(
     user_id: str,
     user_data: UserUpdate,
     request: Request,
-    accept_language: Optional[str] = Header("en"),
+    lang: str = Depends(get_lang),
 ):
     """Update user"""
     # Validate user_id format
@@ -176,28 +146,11 @@ async def update_user(
     if not user:
         raise ResourceNotFoundError(resource="User", identifier=user_id, searched_by="id")
 
-    # Extraire la langue
-    lang = accept_language.split(",")[0].strip()[:2]
-
-    # Convertir en dictionnaire
-    user_dict = user.model_dump()
-
-    # REMPLACER les dates
-    if user_dict.get("registerDate"):
-        user_dict["registerDate"] = format_date(user.registerDate, lang)
-
-    if user_dict.get("dateOfBirth") and user.dateOfBirth:
-        user_dict["dateOfBirth"] = format_date(user.dateOfBirth, lang)
-
-    # HATEOAS
-    base_url = str(request.base_url).rstrip("/")
-    user_dict["_links"] = add_user_hateoas_links(user.id, base_url)
-
-    return user_dict
+    return user_full_to_response(user, lang, get_base_url(request))
 
 
 @router.delete("/{user_id}", response_model=DeleteResponse)
-async def delete_user(user_id: str, accept_language: Optional[str] = Header("en")):
+async def delete_user(user_id: str):
     """Delete user"""
     # Validate user_id format
     validate_user_id(user_id)
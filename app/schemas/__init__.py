@@ -1,5 +1,5 @@
 from .comment import Comment, CommentCreate
-from .common import DeleteResponse, PaginatedResponse, SortOrder
+from .common import DeleteResponse, PaginatedResponse, SortDirection, SortOrder
 from .post import PostCreate, PostFull, PostPreview, PostUpdate
 from .user import UserCreate, UserFull, UserPreview, UserUpdate
 
@@ -17,4 +17,5 @@ __all__ = [
     "PaginatedResponse",
     "DeleteResponse",
     "SortOrder",
+    "SortDirection",
 ]
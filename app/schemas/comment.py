@@ -23,3 +23,6 @@ class Comment(BaseModel):
     post: str  # Post ID
     publishDate: datetime
     _links: Optional[dict] = None
+
+    class Config:
+        frozen = True
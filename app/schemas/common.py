@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Generic, List, Optional, TypeVar
+from typing import Generic, List, Literal, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -13,6 +13,10 @@ class SortOrder(str, Enum):
     DESC = "desc"
 
 
+# Query-parameter form of SortOrder: FastAPI hands handlers the bare string
+SortDirection = Literal["asc", "desc"]
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic paginated response"""
 
@@ -20,9 +24,10 @@ class PaginatedResponse(BaseModel, Generic[T]):
     total: int = Field(..., description="Total items in database")
     page: int = Field(..., description="Current page number")
     limit: int = Field(..., description="Number of items per page")
-    _links: Optional[dict] = None
+    links: Optional[dict] = Field(None, alias="_links", description="HATEOAS pagination links")
 
     class Config:
+        populate_by_name = True
         json_schema_extra = {"example": {"data": [], "total": 100, "page": 1, "limit": 20}}
 
 
@@ -39,6 +39,9 @@ class PostPreview(BaseModel):
     owner: UserPreview
     _links: Optional[dict] = None
 
+    class Config:
+        frozen = True
+
 
 class PostFull(BaseModel):
     """Post Full - complete post data"""
@@ -52,3 +55,6 @@ class PostFull(BaseModel):
     publishDate: datetime
     owner: UserPreview
     _links: Optional[dict] = None
+
+    class Config:
+        frozen = True
@@ -32,6 +32,9 @@ class UserPreview(BaseModel):
     picture: str
     _links: Optional[dict] = None
 
+    class Config:
+        frozen = True
+
 
 class UserCreate(BaseModel):
     """User Create - for POST requests"""
@@ -81,3 +84,6 @@ class UserFull(BaseModel):
     picture: str
     location: Optional[Location] = None
     _links: Optional[dict] = None
+
+    class Config:
+        frozen = True
@@ -0,0 +1,15 @@
+from app.database import get_database
+
+
+class CollectionService:
+    """Base for services working on one MongoDB collection, named by collection_name"""
+
+    collection_name: str
+    _collection = None
+
+    @property
+    def collection(self):
+        """Collection handle, bound on first use (after the database is configured)"""
+        if self._collection is None:
+            self._collection = get_database()[self.collection_name]
+        return self._collection
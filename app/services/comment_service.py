@@ -1,27 +1,31 @@
-from datetime import datetime
+import asyncio
 from typing import List, Optional, Tuple
 
 from bson import ObjectId
 
 from app.database import get_database
 from app.schemas.comment import Comment, CommentCreate
+from app.schemas.user import UserPreview
+from app.services.base import CollectionService
 from app.services.user_service import UserService
-from app.utils.errors import BodyNotValidError, ResourceNotFoundError
+from app.utils.dates import utc_now_ms
+from app.utils.errors import BodyNotValidError
+from app.utils.object_id import is_object_id, normalize_object_id
+from app.utils.pagination import keyset_filter
 
+# Only the fields used to build a Comment (_id is always returned)
+COMMENT_PROJECTION = {"message": 1, "owner": 1, "post": 1, "publishDate": 1}
 
-class CommentService:
+
+class CommentService(CollectionService):
     def __init__(self):
         self.collection_name = "comments"
         self.user_service = UserService()
 
-    async def _comment_dict_to_model(self, comment_dict: dict) -> Comment:
-        """Convert MongoDB comment dict to Comment model"""
-        # Get owner preview
-        owner = await self.user_service.get_user_preview_by_id(comment_dict["owner"])
-        if not owner:
-            raise ResourceNotFoundError(f"User {comment_dict['owner']} not found")
-
-        return Comment(
+    def _comment_dict_to_model(self, comment_dict: dict, owner: UserPreview) -> Comment:
+        """Convert MongoDB comment dict and its resolved owner to Comment model"""
+        # Fields come from the database or validated input: skip pydantic validation
+        return Comment.model_construct(
             id=str(comment_dict["_id"]),
             message=comment_dict["message"],
             owner=owner,
@@ -36,55 +40,103 @@ class CommentService:
         sort_by: str = "publishDate",
         sort_order: str = "desc",
         filters: dict = None,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[Comment], int]:
-        """Get paginated list of comments"""
-        db = get_database()
-        collection = db[self.collection_name]
+        """Get paginated list of comments (keyset pagination when a cursor is given)"""
+        collection = self.collection
 
         query = filters if filters else {}
 
         # Validate ObjectIds if present
-        if "owner" in query and not ObjectId.is_valid(query["owner"]):
+        if "owner" in query and not is_object_id(query["owner"]):
             return [], 0
-        if "post" in query and not ObjectId.is_valid(query["post"]):
+        if "post" in query and not is_object_id(query["post"]):
             return [], 0
-
-        total = await collection.count_documents(query)
+        # Same canonical form as the stored ids
+        query = {
+            k: normalize_object_id(v) if k in ("owner", "post") else v for k, v in query.items()
+        }
 
         sort_direction = -1 if sort_order == "desc" else 1
+        # _id tie-break keeps page boundaries stable between equal publishDates
+        sort = [(sort_by, sort_direction), ("_id", sort_direction)]
         skip = (page - 1) * limit
 
-        cursor = collection.find(query).sort(sort_by, sort_direction).skip(skip).limit(limit)
+        if cursor:
+            # Seek past the last item seen instead of skipping: O(limit) at any depth
+            after = keyset_filter(cursor, sort_order)
+            page_query = {"$and": [query, after]} if query else after
+            page_cursor = (
+                collection.find(page_query, COMMENT_PROJECTION)
+                .sort(sort)
+                .limit(limit)
+                .batch_size(limit)
+            )
+            count = (
+                collection.count_documents(query)
+                if query
+                else collection.estimated_document_count()
+            )
+            total, comment_dicts = await asyncio.gather(count, page_cursor.to_list(length=limit))
+        elif query:
+            # Page + total in a single round-trip
+            pipeline = [
+                {"$match": query},
+                {
+                    "$facet": {
+                        "data": [
+                            {"$sort": dict(sort)},
+                            {"$skip": skip},
+                            {"$limit": limit},
+                            {"$project": COMMENT_PROJECTION},
+                        ],
+                        "total": [{"$count": "n"}],
+                    }
+                },
+            ]
+            result = await collection.aggregate(pipeline).to_list(length=1)
+            comment_dicts = result[0]["data"]
+            total = result[0]["total"][0]["n"] if result[0]["total"] else 0
+        else:
+            # Unfiltered total comes from collection metadata, fetched alongside the page
+            page_cursor = collection.find(query, COMMENT_PROJECTION).sort(sort)
+            page_cursor = page_cursor.skip(skip).limit(limit).batch_size(limit)
+            total, comment_dicts = await asyncio.gather(
+                collection.estimated_document_count(), page_cursor.to_list(length=limit)
+            )
+
+        # One $in query for every owner on the page instead of one find_one per comment
+        owners = await self.user_service.get_user_previews_by_ids(
+            comment_dict["owner"] for comment_dict in comment_dicts
+        )
 
-        comments = []
-        async for comment_dict in cursor:
-            try:
-                comments.append(await self._comment_dict_to_model(comment_dict))
-            except ResourceNotFoundError:
-                # Skip comments with invalid owners
-                continue
+        # Comments with invalid owners are skipped
+        comments = [
+            self._comment_dict_to_model(comment_dict, owner)
+            for comment_dict in comment_dicts
+            if (owner := owners.get(normalize_object_id(comment_dict["owner"]))) is not None
+        ]
 
         return comments, total
 
     async def get_comment_by_id(self, comment_id: str) -> Optional[Comment]:
         """Get comment by ID"""
-        if not ObjectId.is_valid(comment_id):
+        if not is_object_id(comment_id):
             return None
 
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
-        comment_dict = await collection.find_one({"_id": ObjectId(comment_id)})
+        comment_dict = await collection.find_one({"_id": ObjectId(comment_id)}, COMMENT_PROJECTION)
 
         if not comment_dict:
             return None
 
-        return await self._comment_dict_to_model(comment_dict)
+        owner = await self.user_service.get_owner_preview(comment_dict["owner"])
+        return self._comment_dict_to_model(comment_dict, owner)
 
     async def create_comment(self, comment_data: CommentCreate) -> Comment:
         """Create new comment"""
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
         # Verify owner exists
         owner = await self.user_service.get_user_preview_by_id(comment_data.owner)
@@ -92,33 +144,33 @@ class CommentService:
             raise BodyNotValidError(f"User with id {comment_data.owner} not found")
 
         # Verify post exists
-        posts_collection = db["posts"]
-        if not ObjectId.is_valid(comment_data.post):
+        posts_collection = get_database()["posts"]
+        if not is_object_id(comment_data.post):
             raise BodyNotValidError(f"Invalid post id {comment_data.post}")
 
-        post = await posts_collection.find_one({"_id": ObjectId(comment_data.post)})
+        # Existence check only: _id projection is answered from the _id index
+        post = await posts_collection.find_one({"_id": ObjectId(comment_data.post)}, {"_id": 1})
         if not post:
             raise BodyNotValidError(f"Post with id {comment_data.post} not found")
 
         # Prepare comment document
         comment_dict = comment_data.model_dump()
-        comment_dict["publishDate"] = datetime.utcnow()
-
-        # Insert comment
-        result = await collection.insert_one(comment_dict)
+        comment_dict["publishDate"] = utc_now_ms()
+        # Ids stored in canonical form so owner lookups and filters match on equality
+        comment_dict["owner"] = normalize_object_id(comment_data.owner)
+        comment_dict["post"] = normalize_object_id(comment_data.post)
 
-        # Get created comment
-        created_comment = await collection.find_one({"_id": result.inserted_id})
+        # Insert comment (insert_one sets comment_dict["_id"]): no read-back, owner already known
+        await collection.insert_one(comment_dict)
 
-        return await self._comment_dict_to_model(created_comment)
+        return self._comment_dict_to_model(comment_dict, owner)
 
     async def delete_comment(self, comment_id: str) -> bool:
         """Delete comment"""
-        if not ObjectId.is_valid(comment_id):
+        if not is_object_id(comment_id):
             return False
 
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
         result = await collection.delete_one({"_id": ObjectId(comment_id)})
 
@@ -1,31 +1,45 @@
-from datetime import datetime
+import asyncio
 from typing import List, Optional, Tuple
 
 from bson import ObjectId
+from pymongo import ReturnDocument
 
-from app.database import get_database
 from app.schemas.post import PostCreate, PostFull, PostPreview, PostUpdate
+from app.schemas.user import UserPreview
+from app.services.base import CollectionService
+from app.services.tag_service import clear_tags_cache
 from app.services.user_service import UserService
-from app.utils.errors import BodyNotValidError, ResourceNotFoundError
-
-
-class PostService:
+from app.utils.dates import utc_now_ms
+from app.utils.errors import BodyNotValidError
+from app.utils.object_id import is_object_id
+from app.utils.pagination import keyset_filter
+
+# Only the fields used to build a PostPreview (_id is always returned)
+POST_PREVIEW_PROJECTION = {
+    "text": 1,
+    "image": 1,
+    "likes": 1,
+    "tags": 1,
+    "publishDate": 1,
+    "owner": 1,
+}
+# PostFull adds the link
+POST_FULL_PROJECTION = {**POST_PREVIEW_PROJECTION, "link": 1}
+
+
+class PostService(CollectionService):
     def __init__(self):
         self.collection_name = "posts"
         self.user_service = UserService()
 
-    async def _post_dict_to_preview(self, post_dict: dict) -> PostPreview:
-        """Convert MongoDB post dict to PostPreview"""
-        # Get owner preview
-        owner = await self.user_service.get_user_preview_by_id(post_dict["owner"])
-        if not owner:
-            raise ResourceNotFoundError(f"User {post_dict['owner']} not found")
-
+    def _post_dict_to_preview(self, post_dict: dict, owner: UserPreview) -> PostPreview:
+        """Convert MongoDB post dict and its resolved owner to PostPreview"""
         # Truncate text for preview (6-50 chars)
         text = post_dict["text"]
         preview_text = text[:50] if len(text) > 50 else text
 
-        return PostPreview(
+        # Stored data already matches the schema: build without re-validating
+        return PostPreview.model_construct(
             id=str(post_dict["_id"]),
             text=preview_text,
             image=post_dict.get("image", ""),
@@ -35,14 +49,9 @@ class PostService:
             owner=owner,
         )
 
-    async def _post_dict_to_full(self, post_dict: dict) -> PostFull:
-        """Convert MongoDB post dict to PostFull"""
-        # Get owner preview
-        owner = await self.user_service.get_user_preview_by_id(post_dict["owner"])
-        if not owner:
-            raise ResourceNotFoundError(f"User {post_dict['owner']} not found")
-
-        return PostFull(
+    def _post_dict_to_full(self, post_dict: dict, owner: UserPreview) -> PostFull:
+        """Convert MongoDB post dict and its resolved owner to PostFull"""
+        return PostFull.model_construct(
             id=str(post_dict["_id"]),
             text=post_dict["text"],
             image=post_dict.get("image", ""),
@@ -60,53 +69,106 @@ class PostService:
         sort_by: str = "publishDate",
         sort_order: str = "desc",
         filters: dict = None,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[PostPreview], int]:
-        """Get paginated list of posts"""
-        db = get_database()
-        collection = db[self.collection_name]
+        """Get paginated list of posts (keyset pagination on publishDate when a cursor is given)"""
+        collection = self.collection
 
         query = filters if filters else {}
 
-        # If filtering by owner, validate it's a valid ObjectId
-        if "owner" in query and not ObjectId.is_valid(query["owner"]):
-            return [], 0
-
-        total = await collection.count_documents(query)
+        # If filtering by owner, validate it's a valid ObjectId (owner is stored as ObjectId)
+        if "owner" in query:
+            if not is_object_id(query["owner"]):
+                return [], 0
+            query = {**query, "owner": ObjectId(query["owner"])}
 
         sort_direction = -1 if sort_order == "desc" else 1
+        # _id tie-break keeps page boundaries stable between equal sort values
+        sort = [(sort_by, sort_direction), ("_id", sort_direction)]
         skip = (page - 1) * limit
 
-        cursor = collection.find(query).sort(sort_by, sort_direction).skip(skip).limit(limit)
+        if cursor and sort_by == "publishDate":
+            # Seek past the last post seen instead of skipping: O(limit) at any depth
+            after = keyset_filter(cursor, sort_order)
+            page_query = {"$and": [query, after]} if query else after
+            page_cursor = (
+                collection.find(page_query, POST_PREVIEW_PROJECTION)
+                .sort(sort)
+                .limit(limit)
+                .batch_size(limit)
+            )
+            count = (
+                collection.count_documents(query)
+                if query
+                else collection.estimated_document_count()
+            )
+            total, post_dicts = await asyncio.gather(count, page_cursor.to_list(length=limit))
+        elif query:
+            # Page + total in a single round-trip ($sort before $skip/$limit => top-n sort)
+            pipeline = [
+                {"$match": query},
+                {
+                    "$facet": {
+                        "data": [
+                            {"$sort": dict(sort)},
+                            {"$skip": skip},
+                            {"$limit": limit},
+                            # Per-row stages ($project, any $lookup) stay after $limit:
+                            # they then run on at most `limit` documents, not the whole match
+                            {"$project": POST_PREVIEW_PROJECTION},
+                        ],
+                        "total": [{"$count": "n"}],
+                    }
+                },
+            ]
+            result = await collection.aggregate(pipeline).to_list(length=1)
+            post_dicts = result[0]["data"]
+            total = result[0]["total"][0]["n"] if result[0]["total"] else 0
+        else:
+            # Unfiltered total comes from collection metadata, fetched alongside the page
+            page_cursor = (
+                collection.find(query, POST_PREVIEW_PROJECTION)
+                .sort(sort)
+                .skip(skip)
+                .limit(limit)
+                .batch_size(limit)
+            )
+            total, post_dicts = await asyncio.gather(
+                collection.estimated_document_count(), page_cursor.to_list(length=limit)
+            )
+
+        # One $in query for every owner on the page instead of one find_one per post
+        owners = await self.user_service.get_user_previews_by_ids(
+            str(post_dict["owner"]) for post_dict in post_dicts
+        )
 
-        posts = []
-        async for post_dict in cursor:
-            try:
-                posts.append(await self._post_dict_to_preview(post_dict))
-            except ResourceNotFoundError:
-                # Skip posts with invalid owners
-                continue
+        # Posts with invalid owners are skipped
+        posts = [
+            self._post_dict_to_preview(post_dict, owner)
+            for post_dict in post_dicts
+            if (owner := owners.get(str(post_dict["owner"]))) is not None
+        ]
 
         return posts, total
 
     async def get_post_by_id(self, post_id: str) -> Optional[PostFull]:
         """Get post by ID"""
-        if not ObjectId.is_valid(post_id):
+        if not is_object_id(post_id):
             return None
 
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
-        post_dict = await collection.find_one({"_id": ObjectId(post_id)})
+        post_dict = await collection.find_one({"_id": ObjectId(post_id)}, POST_FULL_PROJECTION)
 
         if not post_dict:
             return None
 
-        return await self._post_dict_to_full(post_dict)
+        owner = await self.user_service.get_owner_preview(str(post_dict["owner"]))
+        return self._post_dict_to_full(post_dict, owner)
 
     async def create_post(self, post_data: PostCreate) -> PostFull:
         """Create new post"""
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
         # Verify owner exists
         owner = await self.user_service.get_user_preview_by_id(post_data.owner)
@@ -115,23 +177,22 @@ class PostService:
 
         # Prepare post document
         post_dict = post_data.model_dump()
-        post_dict["publishDate"] = datetime.utcnow()
-
-        # Insert post
-        result = await collection.insert_one(post_dict)
+        post_dict["publishDate"] = utc_now_ms()
+        # Owner stored as ObjectId: same type as users._id, no string round-trip in queries
+        post_dict["owner"] = ObjectId(post_data.owner)
 
-        # Get created post
-        created_post = await collection.find_one({"_id": result.inserted_id})
+        # Insert post (insert_one sets post_dict["_id"]): no read-back, owner already known
+        await collection.insert_one(post_dict)
+        clear_tags_cache()
 
-        return await self._post_dict_to_full(created_post)
+        return self._post_dict_to_full(post_dict, owner)
 
     async def update_post(self, post_id: str, post_data: PostUpdate) -> Optional[PostFull]:
         """Update post (owner cannot be updated)"""
-        if not ObjectId.is_valid(post_id):
+        if not is_object_id(post_id):
             return None
 
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
         # Build update dict
         update_dict = {k: v for k, v in post_data.model_dump().items() if v is not None}
@@ -141,22 +202,29 @@ class PostService:
 
         # Update post
         result = await collection.find_one_and_update(
-            {"_id": ObjectId(post_id)}, {"$set": update_dict}, return_document=True
+            {"_id": ObjectId(post_id)},
+            {"$set": update_dict},
+            projection=POST_FULL_PROJECTION,
+            return_document=ReturnDocument.AFTER,
         )
 
         if not result:
             return None
+        if "tags" in update_dict:
+            clear_tags_cache()
 
-        return await self._post_dict_to_full(result)
+        owner = await self.user_service.get_owner_preview(str(result["owner"]))
+        return self._post_dict_to_full(result, owner)
 
     async def delete_post(self, post_id: str) -> bool:
         """Delete post"""
-        if not ObjectId.is_valid(post_id):
+        if not is_object_id(post_id):
             return False
 
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
         result = await collection.delete_one({"_id": ObjectId(post_id)})
+        if result.deleted_count:
+            clear_tags_cache()
 
         return result.deleted_count > 0
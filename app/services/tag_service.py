@@ -1,26 +1,31 @@
 from typing import List
 
-from app.database import get_database
+from cachetools import TTLCache
 
+from app.services.base import CollectionService
 
-class TagService:
+# Le jeu de tags évolue lentement : une seule entrée, rafraîchie toutes les 60 s
+_tags_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
+
+
+def clear_tags_cache() -> None:
+    """Drop the cached tag list, after a write that may add or remove tags"""
+    _tags_cache.clear()
+
+
+class TagService(CollectionService):
     def __init__(self):
         self.collection_name = "posts"
 
     async def get_all_tags(self) -> List[str]:
         """Get list of all unique tags from posts"""
-        db = get_database()
-        collection = db[self.collection_name]
-
-        # Use MongoDB aggregation to get distinct tags
-        pipeline = [
-            {"$unwind": "$tags"},
-            {"$group": {"_id": "$tags"}},
-            {"$sort": {"_id": 1}},
-        ]
+        tags = _tags_cache.get(self.collection_name)
+        if tags is not None:
+            return tags
 
-        tags = []
-        async for doc in collection.aggregate(pipeline):
-            tags.append(doc["_id"])
+        collection = self.collection
 
+        # distinct walks the tags index keys instead of unwinding every post
+        tags = sorted(await collection.distinct("tags"))
+        _tags_cache[self.collection_name] = tags
         return tags
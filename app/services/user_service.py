@@ -1,20 +1,48 @@
-from datetime import datetime
-from typing import List, Optional, Tuple
+import asyncio
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from bson import ObjectId
-
-from app.database import get_database
-from app.schemas.user import UserCreate, UserFull, UserPreview, UserUpdate
-from app.utils.errors import BodyNotValidError
-
-
-class UserService:
+from cachetools import TTLCache
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.schemas.user import Location, UserCreate, UserFull, UserPreview, UserUpdate
+from app.services.base import CollectionService
+from app.utils.dates import utc_now_ms
+from app.utils.errors import BodyNotValidError, ResourceNotFoundError
+from app.utils.object_id import is_object_id, normalize_object_id
+
+# Only the fields used to build a UserPreview (_id is always returned)
+USER_PREVIEW_PROJECTION = {"title": 1, "firstName": 1, "lastName": 1, "picture": 1}
+# UserFull adds contact and profile fields
+USER_FULL_PROJECTION = {
+    **USER_PREVIEW_PROJECTION,
+    "email": 1,
+    "dateOfBirth": 1,
+    "registerDate": 1,
+    "phone": 1,
+    "location": 1,
+}
+
+# Owner previews shared by every UserService instance (post/comment services hold their own);
+# invalidated on update/delete, the TTL bounds staleness across worker processes
+_preview_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+
+
+def _email_taken_error(email: str) -> BodyNotValidError:
+    """Validation error for a signup with an already registered email"""
+    return BodyNotValidError(
+        [{"field": "email", "value": email, "issue": "A user with this email already exists"}]
+    )
+
+
+class UserService(CollectionService):
     def __init__(self):
         self.collection_name = "users"
 
     def _user_dict_to_preview(self, user_dict: dict) -> UserPreview:
-        """Convert MongoDB user dict to UserPreview"""
-        return UserPreview(
+        """Convert MongoDB user dict to UserPreview (no validation: data was validated on write)"""
+        return UserPreview.model_construct(
             id=str(user_dict["_id"]),
             title=user_dict.get("title", ""),
             firstName=user_dict["firstName"],
@@ -24,7 +52,8 @@ class UserService:
 
     def _user_dict_to_full(self, user_dict: dict) -> UserFull:
         """Convert MongoDB user dict to UserFull"""
-        return UserFull(
+        location = user_dict.get("location")
+        return UserFull.model_construct(
             id=str(user_dict["_id"]),
             title=user_dict.get("title", ""),
             firstName=user_dict["firstName"],
@@ -34,7 +63,7 @@ class UserService:
             registerDate=user_dict["registerDate"],
             phone=user_dict.get("phone"),
             picture=user_dict.get("picture", ""),
-            location=user_dict.get("location"),
+            location=Location.model_construct(**location) if location else None,
         )
 
     async def get_users(
@@ -46,37 +75,58 @@ class UserService:
         filters: dict = None,
     ) -> Tuple[List[UserPreview], int]:
         """Get paginated list of users"""
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
         # Build query
         query = filters if filters else {}
 
-        # Count total
-        total = await collection.count_documents(query)
-
-        # Build sort
         sort_direction = -1 if sort_order == "desc" else 1
-
-        # Get users with pagination
         skip = (page - 1) * limit
-        cursor = collection.find(query).sort(sort_by, sort_direction).skip(skip).limit(limit)
 
-        users = []
-        async for user_dict in cursor:
-            users.append(self._user_dict_to_preview(user_dict))
+        if query:
+            # Page + total in a single round-trip ($sort before $skip/$limit => top-n sort)
+            pipeline = [
+                {"$match": query},
+                {
+                    "$facet": {
+                        "data": [
+                            {"$sort": {sort_by: sort_direction}},
+                            {"$skip": skip},
+                            {"$limit": limit},
+                            {"$project": USER_PREVIEW_PROJECTION},
+                        ],
+                        "total": [{"$count": "n"}],
+                    }
+                },
+            ]
+            result = await collection.aggregate(pipeline).to_list(length=1)
+            user_dicts = result[0]["data"]
+            total = result[0]["total"][0]["n"] if result[0]["total"] else 0
+        else:
+            # Unfiltered total comes from collection metadata, fetched alongside the page
+            cursor = (
+                collection.find(query, USER_PREVIEW_PROJECTION)
+                .sort(sort_by, sort_direction)
+                .skip(skip)
+                .limit(limit)
+                .batch_size(limit)
+            )
+            total, user_dicts = await asyncio.gather(
+                collection.estimated_document_count(), cursor.to_list(length=limit)
+            )
+
+        users = [self._user_dict_to_preview(user_dict) for user_dict in user_dicts]
 
         return users, total
 
     async def get_user_by_id(self, user_id: str) -> Optional[UserFull]:
         """Get user by ID"""
-        if not ObjectId.is_valid(user_id):
+        if not is_object_id(user_id):
             return None
 
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
-        user_dict = await collection.find_one({"_id": ObjectId(user_id)})
+        user_dict = await collection.find_one({"_id": ObjectId(user_id)}, USER_FULL_PROJECTION)
 
         if not user_dict:
             return None
@@ -85,48 +135,78 @@ class UserService:
 
     async def get_user_preview_by_id(self, user_id: str) -> Optional[UserPreview]:
         """Get user preview by ID"""
-        if not ObjectId.is_valid(user_id):
+        # Cache keyed by the canonical id, whatever case the caller used
+        user_id = normalize_object_id(user_id)
+        preview = _preview_cache.get(user_id)
+        if preview is not None:
+            return preview
+
+        if not is_object_id(user_id):
             return None
 
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
-        user_dict = await collection.find_one({"_id": ObjectId(user_id)})
+        user_dict = await collection.find_one({"_id": ObjectId(user_id)}, USER_PREVIEW_PROJECTION)
 
         if not user_dict:
             return None
 
-        return self._user_dict_to_preview(user_dict)
+        preview = _preview_cache[user_id] = self._user_dict_to_preview(user_dict)
+        return preview
+
+    async def get_owner_preview(self, owner_id: str) -> UserPreview:
+        """Get the preview of a post/comment owner, which must exist"""
+        owner = await self.get_user_preview_by_id(owner_id)
+        if not owner:
+            raise ResourceNotFoundError(resource="User", identifier=owner_id)
+        return owner
+
+    async def get_user_previews_by_ids(self, user_ids: Iterable[str]) -> Dict[str, UserPreview]:
+        """Get user previews for many IDs in one query, keyed by normalized user ID"""
+        previews = {}
+        object_ids = []
+        # Keyed by the canonical id: str(user_dict["_id"]) below is lowercase hex
+        for user_id in {normalize_object_id(user_id) for user_id in user_ids}:
+            preview = _preview_cache.get(user_id)
+            if preview is not None:
+                previews[user_id] = preview
+            elif is_object_id(user_id):
+                object_ids.append(ObjectId(user_id))
+        if not object_ids:
+            return previews
+
+        collection = self.collection
+
+        # Only the owners missing from the cache hit the database
+        user_cursor = collection.find({"_id": {"$in": object_ids}}, USER_PREVIEW_PROJECTION)
+        for user_dict in await user_cursor.to_list(length=len(object_ids)):
+            user_id = str(user_dict["_id"])
+            previews[user_id] = _preview_cache[user_id] = self._user_dict_to_preview(user_dict)
+        return previews
 
     async def create_user(self, user_data: UserCreate) -> UserFull:
         """Create new user"""
-        db = get_database()
-        collection = db[self.collection_name]
-
-        # Check if email already exists
-        existing = await collection.find_one({"email": user_data.email})
-        if existing:
-            raise BodyNotValidError(f"User with email {user_data.email} already exists")
+        collection = self.collection
 
         # Prepare user document
         user_dict = user_data.model_dump()
-        user_dict["registerDate"] = datetime.utcnow()
+        user_dict["registerDate"] = utc_now_ms()
 
-        # Insert user
-        result = await collection.insert_one(user_dict)
+        # Insert user (insert_one sets user_dict["_id"]): no read-back needed.
+        # No pre-check: the unique email index (verified by connect_to_mongo) rejects duplicates
+        try:
+            await collection.insert_one(user_dict)
+        except DuplicateKeyError:
+            raise _email_taken_error(user_data.email)
 
-        # Get created user
-        created_user = await collection.find_one({"_id": result.inserted_id})
-
-        return self._user_dict_to_full(created_user)
+        return self._user_dict_to_full(user_dict)
 
     async def update_user(self, user_id: str, user_data: UserUpdate) -> Optional[UserFull]:
         """Update user (email cannot be updated)"""
-        if not ObjectId.is_valid(user_id):
+        if not is_object_id(user_id):
             return None
 
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
         # Build update dict (only non-None values)
         update_dict = {k: v for k, v in user_data.model_dump().items() if v is not None}
@@ -137,8 +217,12 @@ class UserService:
 
         # Update user
         result = await collection.find_one_and_update(
-            {"_id": ObjectId(user_id)}, {"$set": update_dict}, return_document=True
+            {"_id": ObjectId(user_id)},
+            {"$set": update_dict},
+            projection=USER_FULL_PROJECTION,
+            return_document=ReturnDocument.AFTER,
         )
+        _preview_cache.pop(normalize_object_id(user_id), None)
 
         if not result:
             return None
@@ -147,12 +231,12 @@ class UserService:
 
     async def delete_user(self, user_id: str) -> bool:
         """Delete user"""
-        if not ObjectId.is_valid(user_id):
+        if not is_object_id(user_id):
             return False
 
-        db = get_database()
-        collection = db[self.collection_name]
+        collection = self.collection
 
         result = await collection.delete_one({"_id": ObjectId(user_id)})
+        _preview_cache.pop(normalize_object_id(user_id), None)
 
         return result.deleted_count > 0
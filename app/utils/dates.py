@@ -0,0 +1,11 @@
+from datetime import datetime, timezone
+
+
+def utc_now_ms() -> datetime:
+    """Current time as stored by MongoDB: naive UTC, truncated to milliseconds.
+
+    Naive like the dates read back (the client is not tz_aware), and BSON dates keep only
+    milliseconds, so a document returned right after insert matches what is stored.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
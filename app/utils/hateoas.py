@@ -0,0 +1,117 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request
+
+# Bound on distinct (scheme, host, root_path) entries kept on app.state
+_BASE_URL_CACHE_SIZE = 64
+
+
+def get_base_url(request: Request) -> str:
+    """Get the request base URL without trailing slash, cached per scheme/host on app.state"""
+    scope = request.scope
+    key = (scope["scheme"], request.headers.get("host"), scope.get("root_path", ""))
+
+    cache = getattr(request.app.state, "base_url_cache", None)
+    if cache is None:
+        cache = request.app.state.base_url_cache = {}
+
+    base_url = cache.get(key)
+    if base_url is None:
+        base_url = str(request.base_url).rstrip("/")
+        if len(cache) < _BASE_URL_CACHE_SIZE:
+            cache[key] = base_url
+    return base_url
+
+
+def add_post_hateoas_links(post_id: str, owner_id: str, base_url: str) -> dict:
+    """Add HATEOAS links to post"""
+    return {
+        "self": {"href": f"{base_url}/api/v1/posts/{post_id}"},
+        "owner": {"href": f"{base_url}/api/v1/users/{owner_id}"},
+        "comments": {"href": f"{base_url}/api/v1/comments?post={post_id}"},
+    }
+
+
+def add_user_hateoas_links(user_id: str, base_url: str) -> dict:
+    """Add HATEOAS links to user"""
+    return {
+        "self": {"href": f"{base_url}/api/v1/users/{user_id}"},
+        "posts": {"href": f"{base_url}/api/v1/posts/user/{user_id}"},
+        "comments": {"href": f"{base_url}/api/v1/comments/user/{user_id}"},
+    }
+
+
+def add_comment_hateoas_links(comment_id: str, post_id: str, owner_id: str, base_url: str) -> dict:
+    """Add HATEOAS links to comment"""
+    api_url = f"{base_url}/api/v1"
+    return {
+        "self": {"href": f"{api_url}/comments/{comment_id}"},
+        "post": {"href": f"{api_url}/posts/{post_id}"},
+        "owner": {"href": f"{api_url}/users/{owner_id}"},
+    }
+
+
+def add_tag_hateoas_links(tag: str, base_url: str) -> dict:
+    """Add HATEOAS links to tag"""
+    return {
+        "self": {"href": f"{base_url}/api/v1/tags"},
+        "posts": {"href": f"{base_url}/api/v1/posts/tag/{tag}"},
+    }
+
+
+@lru_cache(maxsize=1024)
+def _query_suffix(limit: int, params: Tuple[Tuple[str, str], ...]) -> str:
+    """Build the query tail shared by every pagination link of a listing"""
+    if params:
+        return f"&limit={limit}&{urlencode(params)}"
+    return f"&limit={limit}"
+
+
+def add_pagination_links(
+    base_url: str,
+    endpoint: str,
+    page: int,
+    limit: int,
+    total: int,
+    next_cursor: Optional[str] = None,
+    cursor: Optional[str] = None,
+    **params,
+) -> dict:
+    """Add HATEOAS pagination links.
+
+    In cursor mode "self" carries the cursor of the current request and "next" the one after
+    it; "first", "last" and "prev" stay page-based (offset) links.
+    """
+    # Only the page number differs between links
+    prefix = f"{base_url}{endpoint}?page="
+    suffix = _query_suffix(limit, tuple((k, str(v)) for k, v in params.items() if v is not None))
+    self_href = f"{prefix}{page}{suffix}"
+    if cursor:
+        self_href = f"{self_href}&cursor={cursor}"
+
+    # Empty listing: no page=0 "last" link, nothing to navigate to
+    if total == 0:
+        return {
+            "self": {"href": self_href},
+            "first": {"href": f"{prefix}1{suffix}"},
+        }
+
+    total_pages = max(1, (total + limit - 1) // limit)
+
+    links = {
+        "self": {"href": self_href},
+        "first": {"href": f"{prefix}1{suffix}"},
+        "last": {"href": f"{prefix}{total_pages}{suffix}"},
+    }
+
+    if page > 1:
+        links["prev"] = {"href": f"{prefix}{page - 1}{suffix}"}
+    if page < total_pages:
+        next_href = f"{prefix}{page + 1}{suffix}"
+        if next_cursor:
+            next_href = f"{next_href}&cursor={next_cursor}"
+        links["next"] = {"href": next_href}
+
+    return links
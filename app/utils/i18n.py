@@ -1,8 +1,12 @@
+import logging
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 from babel import Locale
-from babel.dates import format_datetime
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
 
 # Messages traduits
 TRANSLATIONS = {
@@ -35,6 +39,37 @@ TRANSLATIONS = {
 }
 
 
+# Table à plat (langue, clé) -> message : une seule recherche par traduction
+_FLAT_TRANSLATIONS = {
+    (lang, key): message
+    for lang, messages in TRANSLATIONS.items()
+    for key, message in messages.items()
+}
+
+
+def _format_date_en(date: datetime) -> str:
+    """Format anglais : 01/15/2025 at 2:30 PM (same output as babel "MM/dd/yyyy 'at' h:mm a")"""
+    meridiem = "AM" if date.hour < 12 else "PM"
+    return f"{date:%m/%d/%Y} at {date.hour % 12 or 12}:{date:%M} {meridiem}"
+
+
+def _format_date_fr(date: datetime) -> str:
+    """Format français : 15/01/2025 à 14:30 (same output as babel "dd/MM/yyyy 'à' HH:mm")"""
+    return f"{date:%d/%m/%Y à %H:%M}"
+
+
+# Formats purement numériques : pas besoin de passer par babel à chaque appel
+_DATE_FORMATTERS = {"en": _format_date_en, "fr": _format_date_fr}
+
+
+def _get_date_formatter(language: str):
+    """Formatter for a language; get_lang already yields "en"/"fr", so normalize only on a miss"""
+    formatter = _DATE_FORMATTERS.get(language)
+    if formatter is None:
+        formatter = _DATE_FORMATTERS.get(language.lower()[:2], _format_date_en)
+    return formatter
+
+
 class I18n:
     def __init__(self):
         self.locales = {"en": Locale("en", "US"), "fr": Locale("fr", "FR")}
@@ -44,26 +79,16 @@ class I18n:
         if not date:
             return ""
 
-        lang = language.lower()[:2]
-        if lang not in self.locales:
-            lang = "en"
-
-        locale = self.locales[lang]
-
-        # Format avec MM (mois en nombres 01-12)
-        if lang == "fr":
-            # Format français : 15/01/2025 à 14:30
-            return format_datetime(date, format="dd/MM/yyyy 'à' HH:mm", locale=locale)
-        else:
-            # Format anglais : 01/15/2025 at 2:30 PM
-            return format_datetime(date, format="MM/dd/yyyy 'at' h:mm a", locale=locale)
+        return _get_date_formatter(language)(date)
 
     def get_translation(self, key: str, language: str = "en") -> str:
         """Get translation for a key"""
-        lang = language.lower()[:2]
-        if lang not in TRANSLATIONS:
-            lang = "en"
-        return TRANSLATIONS[lang].get(key, key)
+        message = _FLAT_TRANSLATIONS.get((language, key))
+        if message is None:
+            # Unnormalized or unknown language (falls back to English), or unknown key
+            lang = language.lower()[:2]
+            message = _FLAT_TRANSLATIONS.get((lang if lang in TRANSLATIONS else "en", key), key)
+        return message
 
 
 _i18n = None
@@ -73,7 +98,7 @@ def setup_i18n():
     """Initialize i18n"""
     global _i18n
     _i18n = I18n()
-    print(" i18n initialized")
+    logger.info("i18n initialized")
 
 
 def get_i18n() -> I18n:
@@ -88,8 +113,23 @@ def translate(key: str, language: str = "en") -> str:
     return get_i18n().get_translation(key, language)
 
 
+@lru_cache(maxsize=256)
+def parse_lang(header: str) -> str:
+    """Extract the primary two-letter language from an Accept-Language header"""
+    return header.split(",", 1)[0].strip()[:2].lower()
+
+
+def get_lang(request: Request) -> str:
+    """Dependency returning the request language set by LanguageMiddleware"""
+    lang = getattr(request.state, "lang", None)
+    if lang is None:
+        # Router mounted without the middleware: parse the header here
+        lang = request.state.lang = parse_lang(request.headers.get("accept-language") or "en")
+    return lang
+
+
 def format_date(date: Optional[datetime], language: str = "en") -> str:
     """Format a date according to the specified language"""
     if not date:
         return ""
-    return get_i18n().format_date(date, language)
+    return _get_date_formatter(language)(date)
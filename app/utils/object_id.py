@@ -0,0 +1,14 @@
+import re
+
+# Même règle que ObjectId.is_valid pour une str, évaluée en C (is_valid passe par une exception)
+_OBJECT_ID_RE = re.compile(r"\A[0-9a-fA-F]{24}\Z")
+
+
+def is_object_id(value: str) -> bool:
+    """Whether value is a 24-character hex string, i.e. a valid ObjectId"""
+    return isinstance(value, str) and len(value) == 24 and _OBJECT_ID_RE.match(value) is not None
+
+
+def normalize_object_id(value: str) -> str:
+    """Canonical form of a valid ObjectId string, as str(ObjectId(value)) prints it"""
+    return value.lower()
@@ -0,0 +1,36 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from app.utils.errors import ParamsNotValidError
+
+
+def encode_cursor(publish_date: datetime, item_id: str) -> str:
+    """Encode the (publishDate, _id) of the last item of a page as an opaque cursor"""
+    raw = f"{publish_date.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        publish_date, item_id = raw.split("|", 1)
+        return datetime.fromisoformat(publish_date), ObjectId(item_id)
+    except (ValueError, InvalidId):
+        raise ParamsNotValidError(
+            param="cursor",
+            value=cursor,
+            issue="Malformed pagination cursor",
+            expected_format="Cursor returned in _links.next",
+        )
+
+
+def keyset_filter(cursor: str, sort_order: str = "desc", field: str = "publishDate") -> dict:
+    """Build the filter selecting items after the cursor, ties broken on _id"""
+    value, item_id = decode_cursor(cursor)
+    op = "$lt" if sort_order == "desc" else "$gt"
+    return {"$or": [{field: {op: value}}, {field: value, "_id": {op: item_id}}]}
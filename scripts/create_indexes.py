@@ -0,0 +1,22 @@
+"""
+Create the MongoDB indexes the API relies on (run once per deployment, idempotent)
+
+Usage, from the repository root: python -m scripts.create_indexes
+"""
+
+import asyncio
+
+from app.database import MONGO_DB_NAME, client, ensure_indexes
+
+
+async def create_indexes():
+    """Create users, posts and comments indexes on the configured database"""
+    print(f" Creating indexes on {MONGO_DB_NAME}...")
+    await ensure_indexes()
+    print(" Indexes ready")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(create_indexes())
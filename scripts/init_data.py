@@ -1,13 +1,17 @@
 """
-Script to initialize the database with sample data
+Script to initialize the database with sample data (and its indexes)
+
+Usage, from the repository root: python -m scripts.init_data
 """
 
 import asyncio
 import random
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from app.database import ensure_indexes
+
 # Sample data
 SAMPLE_USERS = [
     {
@@ -153,48 +157,63 @@ async def init_database():
     await db.posts.delete_many({})
     await db.comments.delete_many({})
 
-    # Insert users
+    # Indexes first: the unique email index also guards the sample users
+    print(" Creating indexes...")
+    await ensure_indexes(db)
+
+    # Single reference time for every sample date
+    now = datetime.now(timezone.utc)
+
+    # Insert users (one batch per collection: a single round-trip each)
     print(" Creating users...")
-    user_ids = []
-    for user_data in SAMPLE_USERS:
-        user_data["registerDate"] = datetime.utcnow() - timedelta(days=random.randint(30, 365))
-        result = await db.users.insert_one(user_data)
-        user_ids.append(str(result.inserted_id))
+    users_docs = [
+        {**user_data, "registerDate": now - timedelta(days=random.randint(30, 365))}
+        for user_data in SAMPLE_USERS
+    ]
+    result = await db.users.insert_many(users_docs)
+    # ObjectIds as returned: posts store them as is, comments keep the string form
+    user_ids = result.inserted_ids
+    for user_data in users_docs:
         print(f"   ✓ Created user: {user_data['firstName']} {user_data['lastName']}")
 
     # Insert posts
     print("\n Creating posts...")
-    post_ids = []
+    posts_docs = []
     for i, post_template in enumerate(SAMPLE_POSTS_TEMPLATES):
         for j in range(2):  # Create 2 posts per template with different users
-            post_data = {
-                "text": post_template["text"],
-                "image": f"https://picsum.photos/800/600?random={i}{j}",
-                "likes": random.randint(0, 100),
-                "tags": post_template["tags"],
-                "owner": user_ids[random.randint(0, len(user_ids) - 1)],
-                "link": f"https://example.com/article/{i}{j}",
-                "publishDate": datetime.utcnow() - timedelta(days=random.randint(1, 30)),
-            }
-            result = await db.posts.insert_one(post_data)
-            post_ids.append(str(result.inserted_id))
-            print(f"   ✓ Created post {len(post_ids)}: {post_data['text'][:50]}...")
+            posts_docs.append(
+                {
+                    "text": post_template["text"],
+                    "image": f"https://picsum.photos/800/600?random={i}{j}",
+                    "likes": random.randint(0, 100),
+                    "tags": post_template["tags"],
+                    "owner": user_ids[random.randint(0, len(user_ids) - 1)],
+                    "link": f"https://example.com/article/{i}{j}",
+                    "publishDate": now - timedelta(days=random.randint(1, 30)),
+                }
+            )
+    result = await db.posts.insert_many(posts_docs)
+    post_ids = result.inserted_ids
+    for n, post_data in enumerate(posts_docs, start=1):
+        print(f"   ✓ Created post {n}: {post_data['text'][:50]}...")
 
     # Insert comments
     print("\n Creating comments...")
-    comment_count = 0
+    comments_docs = []
     for post_id in post_ids:
         # Random number of comments per post (1-5)
         num_comments = random.randint(1, 5)
         for _ in range(num_comments):
-            comment_data = {
-                "message": random.choice(SAMPLE_COMMENTS),
-                "owner": user_ids[random.randint(0, len(user_ids) - 1)],
-                "post": post_id,
-                "publishDate": datetime.utcnow() - timedelta(days=random.randint(0, 7)),
-            }
-            await db.comments.insert_one(comment_data)
-            comment_count += 1
+            comments_docs.append(
+                {
+                    "message": random.choice(SAMPLE_COMMENTS),
+                    "owner": str(user_ids[random.randint(0, len(user_ids) - 1)]),
+                    "post": str(post_id),
+                    "publishDate": now - timedelta(days=random.randint(0, 7)),
+                }
+            )
+    result = await db.comments.insert_many(comments_docs)
+    comment_count = len(result.inserted_ids)
 
     print(f"   ✓ Created {comment_count} comments")
 
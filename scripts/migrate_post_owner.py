@@ -0,0 +1,27 @@
+"""
+One-off migration: store posts.owner as an ObjectId instead of its string form
+"""
+
+import asyncio
+import os
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+
+async def migrate_post_owner():
+    """Convert every string posts.owner to ObjectId (idempotent)"""
+    client = AsyncIOMotorClient(os.getenv("MONGO_URL", "mongodb://localhost:27017"))
+    db = client[os.getenv("MONGO_DB_NAME", "test_db")]
+
+    # Pipeline update: the conversion runs server-side, no document round-trips
+    result = await db.posts.update_many(
+        {"owner": {"$type": "string"}},
+        [{"$set": {"owner": {"$toObjectId": "$owner"}}}],
+    )
+    print(f" Posts migrated: {result.modified_count}")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_post_owner())
@@ -14,3 +14,115 @@ def test_health_check():
 def test_root():
     response = client.get("/")
     assert response.status_code == 200
+
+
+def test_zstd_compression():
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "zstd, br, gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "zstd"
+
+
+def test_brotli_compression():
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["content-encoding"] == "br"
+
+
+def test_gzip_fallback():
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_security_headers():
+    response = client.get("/health")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["x-frame-options"] == "DENY"
+    assert float(response.headers["x-process-time"]) >= 0
+
+
+def test_item_not_found():
+    response = client.get("/items/999")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Item not found"}
+
+
+def test_unknown_path():
+    response = client.get("/does-not-exist")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Not Found"}
+
+
+def test_openapi_schema():
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    assert response.json()["info"]["title"] == "Network Application API"
+    assert "/openapi.json" not in response.json()["paths"]
+
+
+def test_edge_cache_lists_only_and_cleared_on_write():
+    from fastapi import FastAPI
+
+    from app.middleware.edge_cache import EdgeCacheMiddleware
+
+    posts = {"1": "first"}
+    api = FastAPI()
+
+    @api.get("/api/v1/posts")
+    async def list_posts():
+        return list(posts.values())
+
+    @api.get("/api/v1/posts/{post_id}")
+    async def get_post(post_id: str):
+        return posts[post_id]
+
+    @api.delete("/api/v1/posts/{post_id}")
+    async def delete_post(post_id: str):
+        return posts.pop(post_id)
+
+    api.add_middleware(EdgeCacheMiddleware)
+    api_client = TestClient(api)
+
+    assert api_client.get("/api/v1/posts").headers["x-cache"] == "MISS"
+    assert api_client.get("/api/v1/posts").headers["x-cache"] == "HIT"
+    assert "x-cache" not in api_client.get("/api/v1/posts/1").headers
+
+    api_client.delete("/api/v1/posts/1")
+    response = api_client.get("/api/v1/posts")
+    assert response.headers["x-cache"] == "MISS"
+    assert response.json() == []
+
+
+def test_pagination_links_empty_listing():
+    from app.utils.hateoas import add_pagination_links
+
+    links = add_pagination_links("http://api", "/api/v1/posts", page=1, limit=10, total=0)
+    assert set(links) == {"self", "first"}
+
+    links = add_pagination_links("http://api", "/api/v1/posts", page=1, limit=10, total=5)
+    assert "next" not in links
+    assert "page=1&" in links["last"]["href"]
+
+
+def test_cursor_round_trip_and_keyset_filter():
+    from datetime import datetime
+
+    import pytest
+    from bson import ObjectId
+
+    from app.utils.errors import ParamsNotValidError
+    from app.utils.pagination import decode_cursor, encode_cursor, keyset_filter
+
+    publish_date, item_id = datetime(2024, 3, 1, 12, 30), ObjectId()
+    cursor = encode_cursor(publish_date, str(item_id))
+    assert decode_cursor(cursor) == (publish_date, item_id)
+
+    for malformed in ("not-a-cursor", encode_cursor(publish_date, "bad-id")):
+        with pytest.raises(ParamsNotValidError):
+            decode_cursor(malformed)
+
+    for sort_order, op in (("desc", "$lt"), ("asc", "$gt")):
+        assert keyset_filter(cursor, sort_order) == {
+            "$or": [
+                {"publishDate": {op: publish_date}},
+                {"publishDate": publish_date, "_id": {op: item_id}},
+            ]
+        }